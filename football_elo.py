@@ -1,10 +1,30 @@
 import math
 import json
+import gzip
+import hashlib
+import heapq
 import os
 import shutil
+import sys
+import time
 import random
+import multiprocessing
+from bisect import bisect
+from array import array
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import accumulate, permutations
+from operator import add, itemgetter
+
+try:
+    import orjson  # Optional: much faster JSON encoding and decoding
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streams the data file instead of reading it whole
+except ImportError:
+    ijson = None
 
 # --- Configuration ---
 INITIAL_RATING = 1500.0
@@ -22,43 +42,84 @@ GD_MULTIPLIERS = {
 
 HOME_ADVANTAGE = 60.0
 
-JSON_FILENAME = "elo_championship_data.json"
+# GD_MULTIPLIERS flattened into a tuple indexed by min(goal_diff, 5); index 0 is a draw
+_GD_MULT = (1.0,) + tuple(GD_MULTIPLIERS[goal_diff] for goal_diff in range(1, 6))
+
+# Rating offset and display suffix for team A, keyed by is_home_a
+_HOME_ADV = {True: HOME_ADVANTAGE, False: -HOME_ADVANTAGE, None: 0.0}
+_HOME_STR = {True: " (H)", False: " (A)", None: ""}
+
+# 10 ** (x / 400) == exp(x * ln(10) / 400); exp is a single cheap libm call
+_LN10_OVER_400 = math.log(10) / 400.0
+
+# Simulated scorelines: goal values and their cumulative sampling weights
+_WINNER_GOALS = [1, 2, 3, 4, 5]
+_WINNER_CUM_WEIGHTS = list(accumulate([30, 35, 20, 10, 5]))
+_LOSER_GOALS = [0, 1, 2]
+_LOSER_CUM_WEIGHTS = list(accumulate([50, 35, 15]))
+_DRAW_GOALS = [0, 1, 2, 3]
+_DRAW_CUM_WEIGHTS = list(accumulate([20, 40, 30, 10]))
+
+JSON_FILENAME = "elo_championship_data.json"  # End the name in .gz to keep it gzip-compressed
 BACKUP_DIR = "elo_backups"
+MAX_BACKUPS = 30  # Older backups are deleted once there are more than this
+JOURNAL_COMPACT_EVERY = 50  # Journaled changes before the data file is rewritten
+MIN_SIMULATIONS = 1000  # Season prediction run size bounds
+MAX_SIMULATIONS = 20000  # More runs barely move the percentages shown
+SIMULATION_MATCH_BUDGET = 4000000  # Simulated matches per season prediction
+PARALLEL_MIN_MATCHES = 500000  # Simulated matches before a season prediction uses worker processes
+SIMULATION_CHUNK_SIZE = 2000  # Seasons simulated per seeded chunk
 
 # --- Backup Functions ---
 
+def file_digest(filename):
+    """Returns a short content hash of a file, used to skip duplicate backups."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def create_backup(filename):
     """Creates a timestamped backup of the data file."""
     if not os.path.exists(filename):
         return
     
-    os.makedirs(BACKUP_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_name = f"backup_{timestamp}.json"
-    backup_path = os.path.join(BACKUP_DIR, backup_name)
-    
     try:
-        shutil.copy2(filename, backup_path)
-        cleanup_old_backups(max_backups=30)
+        # Skip the backup if an identical one already exists
+        content_hash = file_digest(filename)
+        if any(content_hash in backup for backup in list_backups()):
+            return
+        
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        extension = '.json.gz' if is_compressed(filename) else '.json'
+        backup_name = f"backup_{timestamp}_{content_hash}{extension}"
+        backup_path = os.path.join(BACKUP_DIR, backup_name)
+        
+        # The data file is only ever replaced, never rewritten in place,
+        # so a hardlink is a safe zero-copy backup
+        try:
+            os.link(filename, backup_path)
+        except OSError:
+            shutil.copy2(filename, backup_path)
+        cleanup_old_backups()
     except Exception as e:
         print(f"Warning: Could not create backup: {e}")
 
-def cleanup_old_backups(max_backups=30):
-    """Keeps only the most recent backups, deletes older ones."""
-    if not os.path.exists(BACKUP_DIR):
-        return
-    
-    backups = [f for f in os.listdir(BACKUP_DIR) if f.startswith('backup_') and f.endswith('.json')]
-    
-    if len(backups) <= max_backups:
-        return
+def cleanup_old_backups(max_backups=None):
+    """
+    Keeps only the most recent backups, deletes older ones. max_backups
+    defaults to MAX_BACKUPS as set when the cleanup runs.
+    """
+    if max_backups is None:
+        max_backups = MAX_BACKUPS
     
-    # Sort by filename (timestamp is in filename)
-    backups.sort(reverse=True)
+    # Newest first (timestamp is in filename)
+    backups = list_backups()
     
     # Delete old backups
-    backups_to_delete = backups[max_backups:]
-    for backup in backups_to_delete:
+    for backup in backups[max_backups:]:
         try:
             os.remove(os.path.join(BACKUP_DIR, backup))
         except Exception as e:
@@ -69,10 +130,21 @@ def list_backups():
     if not os.path.exists(BACKUP_DIR):
         return []
     
-    backups = [f for f in os.listdir(BACKUP_DIR) if f.startswith('backup_') and f.endswith('.json')]
+    backups = [f for f in os.listdir(BACKUP_DIR) if f.startswith('backup_') and f.endswith(('.json', '.json.gz'))]
     backups.sort(reverse=True)
     return backups
 
+def format_backup_list(backups):
+    """Returns numbered display lines for the given backup file names."""
+    lines = []
+    for i, backup in enumerate(backups, 1):
+        # Names are 'backup_YYYYMMDD_HHMMSS[_hash].json[.gz]'; reformat by slicing
+        # rather than parsing the timestamp
+        ts = backup[7:22]
+        formatted = f"{ts[:4]}-{ts[4:6]}-{ts[6:8]} {ts[9:11]}:{ts[11:13]}:{ts[13:15]}"
+        lines.append(f"  {i}. {backup} ({formatted})\n")
+    return "".join(lines)
+
 def restore_backup(backup_name, filename):
     """Restores data from a backup file."""
     backup_path = os.path.join(BACKUP_DIR, backup_name)
@@ -85,7 +157,22 @@ def restore_backup(backup_name, filename):
         if os.path.exists(filename):
             create_backup(filename)
         
-        shutil.copy2(backup_path, filename)
+        # Copy next to the data file and swap it in, so the backup itself
+        # (which may be a hardlink) is never written through
+        tmp_path = filename + '.tmp'
+        if is_compressed(backup_name) == is_compressed(filename):
+            shutil.copy2(backup_path, tmp_path)
+        else:
+            # Backup from before the data file switched to or from gzip
+            with open_data_file(backup_path, 'rb', is_compressed(backup_name)) as src, \
+                    open_data_file(tmp_path, 'wb', is_compressed(filename)) as dst:
+                shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, filename)
+        
+        # The restored file is the whole state; drop matches journaled since
+        journal = journal_path(filename)
+        if os.path.exists(journal):
+            os.remove(journal)
         print(f"Successfully restored from backup: {backup_name}")
         return True
     except Exception as e:
@@ -94,25 +181,116 @@ def restore_backup(backup_name, filename):
 
 # --- Persistence Functions ---
 
+JSON_DECODE_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+if orjson is not None:
+    def dump_json(data, indent=False):
+        """Serializes data to JSON bytes."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    load_json = orjson.loads
+else:
+    _encode_compact = json.JSONEncoder().encode
+
+    def dump_json(data, indent=False):
+        """
+        Serializes data to JSON bytes. With indent, data must be a dict; list
+        values are written one item per line.
+        """
+        if not indent:
+            return _encode_compact(data).encode()
+        # json only uses its C encoder when not indenting, so lists (the
+        # match history) get one compactly encoded item per line instead
+        parts = []
+        for key, value in data.items():
+            if isinstance(value, list) and value:
+                body = "[\n    " + ",\n    ".join(map(_encode_compact, value)) + "\n  ]"
+            else:
+                body = json.dumps(value, indent=2).replace("\n", "\n  ")
+            parts.append(f"  {_encode_compact(key)}: {body}")
+        return ("{\n" + ",\n".join(parts) + "\n}").encode()
+    load_json = json.loads
+
+_now_cache = {'second': None, 'text': None}
+
+# Revision of each data file as last loaded or saved. Journal entries are
+# stamped with it, so a journal the data file already includes is recognised
+_revisions = {}
+
+def _now_str():
+    """Returns the current local time as 'YYYY-MM-DD HH:MM:SS'."""
+    # Format at most once per second; bulk imports stamp many matches at once
+    second = int(time.time())
+    if second != _now_cache['second']:
+        _now_cache['second'] = second
+        _now_cache['text'] = datetime.fromtimestamp(second).isoformat(sep=' ')
+    return _now_cache['text']
+
+def is_compressed(filename):
+    """Returns True for data and backup files stored gzip-compressed."""
+    return filename.endswith('.gz')
+
+def open_data_file(path, mode, compressed):
+    """
+    Opens a data or backup file in binary mode, through gzip if compressed.
+    Compressed output carries no timestamp, so identical data gives identical
+    bytes and duplicate backups are still detected by hash.
+    """
+    if compressed:
+        return gzip.GzipFile(path, mode, compresslevel=6, mtime=0)
+    return open(path, mode)
+
+def journal_path(filename):
+    """Returns the path of the append-only match journal for a data file."""
+    if is_compressed(filename):
+        filename = filename[:-len('.gz')]
+    return os.path.splitext(filename)[0] + '.jsonl'
+
 def load_data(filename):
+    """Loads ratings, match history, and match counts from JSON file and journal."""
+    ratings, match_history, match_counts = load_snapshot(filename)
+    
+    replayed = replay_journal(ratings, match_history, match_counts, filename)
+    if replayed:
+        print(f"Replayed {replayed} journaled matches from '{journal_path(filename)}'.")
+    return ratings, match_history, match_counts
+
+def load_snapshot(filename):
     """Loads ratings, match history, and match counts from JSON file."""
     if os.path.exists(filename):
         try:
-            with open(filename, 'r') as f:
-                content = f.read()
-                if not content:
-                    print(f"Data file '{filename}' is empty. Starting fresh.")
-                    return {}, [], {}
-                
-                data = json.loads(content)
-                ratings = {team: float(rating) for team, rating in data.get('ratings', {}).items()}
+            if os.path.getsize(filename) == 0:
+                print(f"Data file '{filename}' is empty. Starting fresh.")
+                return {}, [], {}
+            
+            with open_data_file(filename, 'rb', is_compressed(filename)) as f:
+                if orjson is None and ijson is not None:
+                    # Parse top-level keys straight off the buffered file, so
+                    # the raw text never has to be held in memory all at once
+                    data = dict(ijson.kvitems(f, '', use_float=True))
+                else:
+                    data = load_json(f.read())
+                # Intern team names so each one exists once in memory and
+                # dict lookups can short-circuit on identity
+                intern = sys.intern
+                ratings = {intern(team): float(rating) for team, rating in data.get('ratings', {}).items()}
                 match_history = data.get('match_history', [])
-                match_counts = {team: int(count) for team, count in data.get('match_counts', {}).items()}
+                match_counts = {intern(team): int(count) for team, count in data.get('match_counts', {}).items()}
+                _revisions[filename] = int(data.get('revision', 0))
+                renumbered = False
+                for i, match in enumerate(match_history, 1):
+                    match['team_a'] = intern(match['team_a'])
+                    match['team_b'] = intern(match['team_b'])
+                    # Match IDs double as list positions
+                    if match.get('match_id') != i:
+                        match['match_id'] = i
+                        renumbered = True
+                if renumbered:
+                    print("Note: match IDs were out of sequence and have been renumbered.")
                 
                 print(f"Successfully loaded data from '{filename}'.")
                 print(f"Loaded {len(ratings)} teams and {len(match_history)} matches.")
                 return ratings, match_history, match_counts
-        except json.JSONDecodeError:
+        except JSON_DECODE_ERRORS:
             print(f"Error: Could not decode JSON from '{filename}'.")
             return {}, [], {}
         except Exception as e:
@@ -125,34 +303,134 @@ def load_data(filename):
 def save_data(ratings, match_history, match_counts, filename):
     """Saves ratings, match history, and match counts to JSON file."""
     try:
+        revision = _revisions.get(filename, 0) + 1
         data = {
             'ratings': ratings,
             'match_history': match_history,
             'match_counts': match_counts,
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'last_updated': _now_str(),
+            'revision': revision
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Write to a temporary file and swap it in atomically; this also
+        # keeps hardlinked backups of the previous version intact
+        # Indenting only helps a file meant to be read as text
+        compressed = is_compressed(filename)
+        tmp_path = filename + '.tmp'
+        with open_data_file(tmp_path, 'wb', compressed) as f:
+            f.write(dump_json(data, indent=not compressed))
+        os.replace(tmp_path, filename)
+        _revisions[filename] = revision
+        
+        # Every journaled change is now in the data file
+        journal = journal_path(filename)
+        if os.path.exists(journal):
+            os.remove(journal)
     except Exception as e:
         print(f"Error: Could not save data to '{filename}': {e}")
 
+def append_match(match_record, filename):
+    """
+    Appends one match record to the journal instead of rewriting the data
+    file. The entry is stamped with the data file's revision; the record
+    itself is left as it is.
+    """
+    journal = journal_path(filename)
+    try:
+        with open(journal, 'ab') as f:
+            f.write(dump_json(dict(match_record, revision=_revisions.get(filename, 0))) + b'\n')
+    except Exception as e:
+        print(f"Error: Could not append match to '{journal}': {e}")
+
+def append_change(change, filename):
+    """
+    Appends an edit or delete to the journal instead of rewriting the data
+    file. change is a dict with an 'op' key ('edit' or 'delete') and a 'match_id'.
+    """
+    append_match(change, filename)
+
+def replay_journal(ratings, match_history, match_counts, filename):
+    """
+    Applies matches, edits and deletes journaled since the data file was
+    last saved. Returns the number of entries applied.
+    """
+    journal = journal_path(filename)
+    if not os.path.exists(journal):
+        return 0
+    
+    revision = _revisions.get(filename, 0)
+    replayed = 0
+    try:
+        with open(journal, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                match = load_json(line)
+                
+                # An entry made against another revision is left over from a
+                # crash between saving and removing the journal, and the data
+                # file already includes it. Match IDs cannot tell such adds
+                # apart once later deletes have shortened the history. Changes
+                # made since the restart were appended after them
+                if match.pop('revision', revision) != revision:
+                    continue
+                
+                if 'op' in match:
+                    match_index = find_match_index(match_history, match['match_id'])
+                    if match_index is None:
+                        print(f"Warning: '{journal}' does not continue the data file. Ignoring the rest.")
+                        break
+                    if match['op'] == 'delete':
+                        remove_match(ratings, match_history, match_counts, match_index)
+                    else:
+                        rescore_match(ratings, match_history, match_counts, match_index,
+                                      match['goals_a'], match['goals_b'])
+                    replayed += 1
+                    continue
+                
+                # Skip matches that already made it into the data file, which
+                # only journals written before entries carried a revision need
+                if match['match_id'] <= len(match_history):
+                    continue
+                if match['match_id'] != len(match_history) + 1:
+                    print(f"Warning: '{journal}' does not continue the data file. Ignoring the rest.")
+                    break
+                
+                match['team_a'] = sys.intern(match['team_a'])
+                match['team_b'] = sys.intern(match['team_b'])
+                match_history.append(match)
+                ratings[match['team_a']] = float(match['rating_a_after'])
+                ratings[match['team_b']] = float(match['rating_b_after'])
+                match_counts[match['team_a']] = match_counts.get(match['team_a'], 0) + 1
+                match_counts[match['team_b']] = match_counts.get(match['team_b'], 0) + 1
+                replayed += 1
+    except json.JSONDecodeError:
+        print(f"Warning: Ignoring incomplete entry at the end of '{journal}'.")
+    except Exception as e:
+        print(f"An error occurred while reading '{journal}': {e}")
+    return replayed
+
 # --- Elo Functions ---
 
-def calculate_expected_score(rating_a, rating_b, home_advantage=0):
+def calculate_expected_score(rating_a, rating_b, home_advantage=0.0):
     """Calculates the expected score for Team A."""
-    try:
-        rating_a = float(rating_a) + home_advantage
-        rating_b = float(rating_b)
-    except ValueError:
-        print(f"Error: Invalid rating format ({rating_a}, {rating_b})")
-        return 0.5
-    return 1 / (1 + math.pow(10, (rating_b - rating_a) / 400))
+    return 1.0 / (1.0 + math.exp(_LN10_OVER_400 * (rating_b - rating_a - home_advantage)))
+
+def _draw_prob(abs_diff):
+    """
+    Returns the draw probability for a given absolute rating difference.
+    Piecewise linear: 27% -> 25% over 0-100, -> 20% at 200, -> 15% at 300,
+    then a flatter slope down to an 8% floor. The first three segments are
+    concave and the tail is convex, so min/max clamps replace the branches.
+    """
+    return max(min(0.27 - 0.0002 * abs_diff, 0.30 - 0.0005 * abs_diff),
+               0.225 - 0.00025 * abs_diff,
+               0.08)
 
 def get_goal_diff_multiplier(goal_diff):
     """Returns the K-factor multiplier based on goal difference."""
     if goal_diff <= 0:
         return 1.0
-    return GD_MULTIPLIERS.get(goal_diff, GD_MULTIPLIERS[5])
+    return _GD_MULT[min(goal_diff, 5)]
 
 def determine_k_factor(team_a_matches, team_b_matches):
     """Determines K-factor based on team experience."""
@@ -168,35 +446,25 @@ def calculate_rating_changes(rating_a, rating_b, matches_a, matches_b, goals_a,
     Calculates what the rating changes would be for a match.
     Returns dict with all match details.
     """
-    home_adv = 0
-    if is_home_a is True:
-        home_adv = HOME_ADVANTAGE
-    elif is_home_a is False:
-        home_adv = -HOME_ADVANTAGE
+    home_adv = _HOME_ADV[is_home_a]
 
     if goals_a > goals_b:
         score_a, score_b = 1.0, 0.0
         goal_diff = goals_a - goals_b
-        winner = 'team_a'
     elif goals_b > goals_a:
         score_a, score_b = 0.0, 1.0
         goal_diff = goals_b - goals_a
-        winner = 'team_b'
     else:
         score_a, score_b = 0.5, 0.5
         goal_diff = 0
-        winner = None
 
     expected_a = calculate_expected_score(rating_a, rating_b, home_adv)
     expected_b = 1 - expected_a
 
     k_base = determine_k_factor(matches_a, matches_b)
     
-    if winner:
-        gd_multiplier = get_goal_diff_multiplier(goal_diff)
-        k_adjusted = k_base * gd_multiplier
-    else:
-        k_adjusted = k_base
+    gd_multiplier = get_goal_diff_multiplier(goal_diff)
+    k_adjusted = k_base * gd_multiplier
 
     change_a = k_adjusted * (score_a - expected_a)
     change_b = k_adjusted * (score_b - expected_b)
@@ -208,11 +476,13 @@ def calculate_rating_changes(rating_a, rating_b, matches_a, matches_b, goals_a,
         'expected_b': expected_b,
         'k_adjusted': k_adjusted,
         'k_base': k_base,
-        'gd_multiplier': get_goal_diff_multiplier(goal_diff) if winner else 1.0
+        'gd_multiplier': gd_multiplier
     }
 
-def update_ratings(ratings, match_counts, match_history, team_a, team_b, goals_a, goals_b, is_home_a=None):
-    """Updates Elo ratings and records match in history."""
+def update_ratings(ratings, match_counts, match_history, team_a, team_b, goals_a, goals_b, is_home_a=None, verbose=True):
+    """Updates Elo ratings and records match in history. Prints the result if verbose."""
+    team_a = sys.intern(team_a)
+    team_b = sys.intern(team_b)
     rating_a = float(ratings.get(team_a, INITIAL_RATING))
     rating_b = float(ratings.get(team_b, INITIAL_RATING))
     matches_a = match_counts.get(team_a, 0)
@@ -227,7 +497,7 @@ def update_ratings(ratings, match_counts, match_history, team_a, team_b, goals_a
     # Store match in history BEFORE updating ratings
     match_record = {
         'match_id': len(match_history) + 1,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': _now_str(),
         'team_a': team_a,
         'team_b': team_b,
         'goals_a': goals_a,
@@ -248,26 +518,18 @@ def update_ratings(ratings, match_counts, match_history, team_a, team_b, goals_a
     match_counts[team_a] = matches_a + 1
     match_counts[team_b] = matches_b + 1
 
+    if not verbose:
+        return
+
     # Calculate three-outcome probabilities
-    home_adv = 0
-    if is_home_a is True:
-        home_adv = HOME_ADVANTAGE
-    elif is_home_a is False:
-        home_adv = -HOME_ADVANTAGE
+    home_adv = _HOME_ADV[is_home_a]
     
     adjusted_rating_a = rating_a + home_adv
     rating_diff = adjusted_rating_a - rating_b
     abs_diff = abs(rating_diff)
     
     # Calculate draw probability
-    if abs_diff <= 100:
-        draw_prob = 0.27 - (abs_diff / 100) * 0.02
-    elif abs_diff <= 200:
-        draw_prob = 0.25 - ((abs_diff - 100) / 100) * 0.05
-    elif abs_diff <= 300:
-        draw_prob = 0.20 - ((abs_diff - 200) / 100) * 0.05
-    else:
-        draw_prob = max(0.15 - ((abs_diff - 300) / 200) * 0.05, 0.08)
+    draw_prob = _draw_prob(abs_diff)
     
     # Adjust win probabilities
     remaining_prob = 1.0 - draw_prob
@@ -276,72 +538,239 @@ def update_ratings(ratings, match_counts, match_history, team_a, team_b, goals_a
 
     # Display results
     result_str = f"{team_a} {goals_a} - {goals_b} {team_b}"
-    home_indicator = " (H)" if is_home_a is True else " (A)" if is_home_a is False else ""
+    home_indicator = _HOME_STR[is_home_a]
     
     print(f"\nMatch #{match_record['match_id']}: {result_str}{home_indicator}")
     print(f"Ratings: {team_a} {new_rating_a:.1f} ({changes['change_a']:+.1f}) | {team_b} {new_rating_b:.1f} ({changes['change_b']:+.1f})")
     print(f"Pre-match probabilities: {team_a} {win_a_prob*100:.1f}% | Draw {draw_prob*100:.1f}% | {team_b} {win_b_prob*100:.1f}%")
 
-def recalculate_all_ratings(match_history):
+def import_matches(ratings, match_counts, match_history, matches, progress_every=1000):
+    """
+    Records many results at once, e.g. a season loaded from another source.
+    matches yields (team_a, team_b, goals_a, goals_b, is_home_a) tuples.
+    Prints one progress line per progress_every matches instead of the
+    per-match report. Returns the number of matches recorded.
+    """
+    count = 0
+    for team_a, team_b, goals_a, goals_b, is_home_a in matches:
+        update_ratings(ratings, match_counts, match_history, team_a, team_b,
+                       goals_a, goals_b, is_home_a, verbose=False)
+        count += 1
+        if count % progress_every == 0:
+            print(f"Imported {count} matches...")
+    print(f"Imported {count} matches.")
+    return count
+
+def replay_matches(match_history, start_index, ratings, match_counts):
     """
-    Recalculates all ratings from scratch based on match history.
-    Used after deleting or editing matches.
+    Replays match_history[start_index:] on top of the given ratings and
+    match counts. Updates both dicts and the match records in place.
     """
-    ratings = {}
-    match_counts = {}
+    tail = match_history[start_index:]
+
+    # Work on dense team indices and flat columns instead of hashing
+    # team names and record keys per match
+    teams, idx_a, idx_b, goals_a, goals_b = history_columns(tail)
+    is_home_a = [match['is_home_a'] for match in tail]
+
+    ratings_arr = [ratings.get(team, INITIAL_RATING) for team in teams]
+    counts_arr = [match_counts.get(team, 0) for team in teams]
+    results = []
+
+    # Bind everything the loop touches to locals; the body below is
+    # calculate_rating_changes inlined, without its per-match calls and dict
+    exp = math.exp
+    ln10_over_400 = _LN10_OVER_400
+    home_adv_for = _HOME_ADV
+    gd_mult = _GD_MULT
+    k_base = K_FACTOR_BASE
+    k_early = K_FACTOR_EARLY
+    threshold = EARLY_MATCHES_THRESHOLD
+
+    # Elo is a left fold, so the replay itself stays sequential
+    for ia, ib, ga, gb, home in zip(idx_a, idx_b, goals_a, goals_b, is_home_a):
+        rating_a = ratings_arr[ia]
+        rating_b = ratings_arr[ib]
+
+        avg_matches = (counts_arr[ia] + counts_arr[ib]) / 2
+        if avg_matches < threshold:
+            k = k_early - (k_early - k_base) * (avg_matches / threshold)
+        else:
+            k = k_base
+
+        if ga > gb:
+            score_a = 1.0
+            k *= gd_mult[min(ga - gb, 5)]
+        elif gb > ga:
+            score_a = 0.0
+            k *= gd_mult[min(gb - ga, 5)]
+        else:
+            score_a = 0.5
+
+        expected_a = 1.0 / (1.0 + exp(ln10_over_400 * (rating_b - rating_a - home_adv_for[home])))
+        change_a = k * (score_a - expected_a)
+        change_b = k * ((1.0 - score_a) - (1 - expected_a))
+
+        new_a = ratings_arr[ia] = rating_a + change_a
+        new_b = ratings_arr[ib] = rating_b + change_b
+        counts_arr[ia] += 1
+        counts_arr[ib] += 1
+        results.append((rating_a, rating_b, new_a, new_b, change_a, change_b))
+
+    # Write recalculated values back into the match records in one pass
+    for match, (before_a, before_b, after_a, after_b, change_a, change_b) in zip(tail, results):
+        match['rating_a_before'] = before_a
+        match['rating_b_before'] = before_b
+        match['rating_a_after'] = after_a
+        match['rating_b_after'] = after_b
+        match['change_a'] = change_a
+        match['change_b'] = change_b
+
+    ratings.update(zip(teams, ratings_arr))
+    match_counts.update(zip(teams, counts_arr))
+
+def rewind_to_match(match_history, index, ratings, match_counts):
+    """
+    Rolls ratings and match counts back, in place, to the state just before
+    match_history[index]. Uses the ratings stored in earlier match records,
+    so only the affected tail is visited instead of the whole history.
+    """
+    tail_teams = set()
+    for match in match_history[index:]:
+        match_counts[match['team_a']] -= 1
+        match_counts[match['team_b']] -= 1
+        tail_teams.add(match['team_a'])
+        tail_teams.add(match['team_b'])
+
+    # Teams with no earlier match disappear, exactly as in a full recalculation
+    pending = set()
+    for team in tail_teams:
+        if match_counts[team] > 0:
+            pending.add(team)
+        else:
+            del ratings[team]
+            del match_counts[team]
+
+    # Each remaining team's rating is the one after its latest earlier match
+    for i in range(index - 1, -1, -1):
+        if not pending:
+            break
+        match = match_history[i]
+        if match['team_a'] in pending:
+            ratings[match['team_a']] = match['rating_a_after']
+            pending.discard(match['team_a'])
+        if match['team_b'] in pending:
+            ratings[match['team_b']] = match['rating_b_after']
+            pending.discard(match['team_b'])
+
+def remove_match(ratings, match_history, match_counts, index):
+    """Deletes match_history[index] and replays only the matches after it."""
+    # Roll back to just before the match, then remove it
+    rewind_to_match(match_history, index, ratings, match_counts)
+    match = match_history.pop(index)
+    mark_history_changed()
+    if index == len(match_history):
+        # Dropping the last match keeps the teams in order of first
+        # appearance, so the patched table matches a rebuilt one exactly
+        patch_league_standings(match_history, removed=[match])
     
-    for match in match_history:
-        team_a = match['team_a']
-        team_b = match['team_b']
-        
-        rating_a = ratings.get(team_a, INITIAL_RATING)
-        rating_b = ratings.get(team_b, INITIAL_RATING)
-        matches_a = match_counts.get(team_a, 0)
-        matches_b = match_counts.get(team_b, 0)
-        
-        changes = calculate_rating_changes(
-            rating_a, rating_b, matches_a, matches_b,
-            match['goals_a'], match['goals_b'], match['is_home_a']
-        )
-        
-        ratings[team_a] = rating_a + changes['change_a']
-        ratings[team_b] = rating_b + changes['change_b']
-        match_counts[team_a] = matches_a + 1
-        match_counts[team_b] = matches_b + 1
-        
-        # Update match record with recalculated values
-        match['rating_a_before'] = rating_a
-        match['rating_b_before'] = rating_b
-        match['rating_a_after'] = ratings[team_a]
-        match['rating_b_after'] = ratings[team_b]
-        match['change_a'] = changes['change_a']
-        match['change_b'] = changes['change_b']
+    # Renumber match IDs
+    for i, m in enumerate(match_history[index:], index + 1):
+        m['match_id'] = i
+    
+    replay_matches(match_history, index, ratings, match_counts)
+
+def rescore_match(ratings, match_history, match_counts, index, goals_a, goals_b):
+    """Changes the score of match_history[index] and replays from it onwards."""
+    rewind_to_match(match_history, index, ratings, match_counts)
+    match = match_history[index]
+    old_match = dict(match)
+    match['goals_a'] = goals_a
+    match['goals_b'] = goals_b
+    mark_history_changed()
+    patch_league_standings(match_history, removed=[old_match], added=[match])
+    replay_matches(match_history, index, ratings, match_counts)
+
+# --- History Index Functions ---
+
+# Bumped whenever existing match records change, move or disappear.
+# Cached views of the history are rebuilt after a bump; plain appends
+# only extend them.
+_history_version = 0
+_team_index_cache = {'history': None, 'version': None, 'length': 0, 'index': None}
+
+def mark_history_changed():
+    """Invalidates cached views of the match history after an in-place change."""
+    global _history_version
+    _history_version += 1
+
+def get_team_index(match_history):
+    """
+    Returns a {team: [match indices]} index over match_history.
+    The index is cached and only extended for matches appended since.
+    """
+    cache = _team_index_cache
+    if (cache['history'] is not match_history or cache['version'] != _history_version
+            or cache['length'] > len(match_history)):
+        cache.update(history=match_history, version=_history_version, length=0, index=defaultdict(list))
+    
+    index = cache['index']
+    for i in range(cache['length'], len(match_history)):
+        index[match_history[i]['team_a']].append(i)
+        index[match_history[i]['team_b']].append(i)
+    cache['length'] = len(match_history)
+    return index
+
+def history_columns(matches):
+    """
+    Splits match records into parallel columns.
+    Returns (teams, idx_a, idx_b, goals_a, goals_b): teams numbered in order
+    of first appearance, then one compact integer array entry per match.
+    """
+    team_to_idx = {}
+    idx_a = array('i')
+    idx_b = array('i')
+    goals_a = array('i')
+    goals_b = array('i')
     
-    return ratings, match_counts
+    for match in matches:
+        idx_a.append(team_to_idx.setdefault(match['team_a'], len(team_to_idx)))
+        idx_b.append(team_to_idx.setdefault(match['team_b'], len(team_to_idx)))
+        goals_a.append(match['goals_a'])
+        goals_b.append(match['goals_b'])
+    
+    return list(team_to_idx), idx_a, idx_b, goals_a, goals_b
 
 # --- Helper Functions ---
 
-def display_rankings(ratings, match_counts):
-    """Displays team rankings with additional statistics."""
+def display_rankings(ratings, match_counts, limit=None):
+    """Displays team rankings with additional statistics, optionally only the top limit teams."""
     if not ratings:
         print("\nNo teams or ratings available yet.")
         return
 
-    sorted_teams = sorted(ratings.items(), key=lambda item: item[1], reverse=True)
-
-    print("\n" + "="*70)
-    print("ELO RANKINGS")
-    print("="*70)
-    print(f"{'Rank':<6} {'Team':<25} {'Rating':<10} {'Matches':<8} {'Status'}")
-    print("-" * 70)
-    
+    if limit is not None and limit < len(ratings):
+        # Partial selection; same order as the full sort, ties included
+        sorted_teams = heapq.nlargest(limit, ratings.items(), key=itemgetter(1))
+    else:
+        sorted_teams = sorted(ratings.items(), key=itemgetter(1), reverse=True)
+
+    # Build the whole table first and write it out in one go
+    lines = [
+        "\n" + "="*70,
+        "ELO RANKINGS",
+        "="*70,
+        f"{'Rank':<6} {'Team':<25} {'Rating':<10} {'Matches':<8} {'Status'}",
+        "-" * 70,
+    ]
     for i, (team, rating) in enumerate(sorted_teams, 1):
         matches = match_counts.get(team, 0)
         status = "Provisional" if matches < EARLY_MATCHES_THRESHOLD else "Established"
-        print(f"{i:<6} {team:<25} {rating:<10.1f} {matches:<8} {status}")
+        lines.append(f"{i:<6} {team:<25} {rating:<10.1f} {matches:<8} {status}")
+    lines.append("-" * 70)
+    lines.append(f"Total Teams: {len(ratings)}\n")
     
-    print("-" * 70)
-    print(f"Total Teams: {len(sorted_teams)}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def display_match_history(match_history, limit=10):
     """Displays recent match history."""
@@ -349,28 +778,34 @@ def display_match_history(match_history, limit=10):
         print("\nNo matches recorded yet.")
         return
     
-    print(f"\n--- Recent Match History (showing last {min(limit, len(match_history))} matches) ---")
+    shown = min(limit, len(match_history))
+    lines = [f"\n--- Recent Match History (showing last {shown} matches) ---"]
     
-    # Show most recent matches first
-    recent_matches = match_history[-limit:] if len(match_history) > limit else match_history
-    recent_matches = list(reversed(recent_matches))
+    # Show most recent matches first, newest to oldest in a single slice
+    recent_matches = match_history[-1:-shown - 1:-1]
     
     for match in recent_matches:
-        home_str = ""
-        if match['is_home_a'] is True:
-            home_str = " (H)"
-        elif match['is_home_a'] is False:
-            home_str = " (A)"
+        home_str = _HOME_STR[match['is_home_a']]
         
-        print(f"\nMatch #{match['match_id']} - {match['timestamp']}")
-        print(f"  {match['team_a']}{home_str if match['is_home_a'] is True else ''} "
-              f"{match['goals_a']} - {match['goals_b']} "
-              f"{match['team_b']}{home_str if match['is_home_a'] is False else ''}")
-        print(f"  Rating changes: {match['team_a']} ({match['change_a']:+.1f}), "
-              f"{match['team_b']} ({match['change_b']:+.1f})")
+        lines.append(f"\nMatch #{match['match_id']} - {match['timestamp']}")
+        lines.append(f"  {match['team_a']}{home_str if match['is_home_a'] is True else ''} "
+                     f"{match['goals_a']} - {match['goals_b']} "
+                     f"{match['team_b']}{home_str if match['is_home_a'] is False else ''}")
+        lines.append(f"  Rating changes: {match['team_a']} ({match['change_a']:+.1f}), "
+                     f"{match['team_b']} ({match['change_b']:+.1f})")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def find_match_index(match_history, match_id):
+    """Returns the list index of the match with the given ID, or None."""
+    # IDs are always 1..len(match_history) in order: they are assigned
+    # sequentially, renumbered on delete and checked on load
+    if 1 <= match_id <= len(match_history):
+        return match_id - 1
+    return None
 
 def undo_last_match(ratings, match_history, match_counts, filename):
-    """Removes the last match and recalculates all ratings."""
+    """Removes the last match and restores the ratings from before it."""
     if not match_history:
         print("\nNo matches to undo.")
         return
@@ -386,16 +821,23 @@ def undo_last_match(ratings, match_history, match_counts, filename):
     
     # Remove last match
     match_history.pop()
+    mark_history_changed()
+    patch_league_standings(match_history, removed=[last_match])
+    
+    # The record holds both teams' ratings going into the match, so no
+    # replay is needed; a team with no match left disappears, as in a recalc
+    for team, rating in ((last_match['team_a'], last_match['rating_a_before']),
+                         (last_match['team_b'], last_match['rating_b_before'])):
+        match_counts[team] -= 1
+        if match_counts[team]:
+            ratings[team] = rating
+        else:
+            del ratings[team]
+            del match_counts[team]
     
-    # Recalculate everything
-    new_ratings, new_counts = recalculate_all_ratings(match_history)
-    ratings.clear()
-    ratings.update(new_ratings)
-    match_counts.clear()
-    match_counts.update(new_counts)
-    
-    save_data(ratings, match_history, match_counts, filename)
-    print("Last match removed and ratings recalculated.")
+    append_change({'op': 'delete', 'match_id': last_match['match_id']}, filename)
+    print("Last match removed and ratings restored.")
+    return True
 
 def delete_match(ratings, match_history, match_counts, filename):
     """Deletes a specific match by ID and recalculates ratings."""
@@ -411,13 +853,7 @@ def delete_match(ratings, match_history, match_counts, filename):
         print("Invalid input.")
         return
     
-    # Find match
-    match_index = None
-    for i, match in enumerate(match_history):
-        if match['match_id'] == match_id:
-            match_index = i
-            break
-    
+    match_index = find_match_index(match_history, match_id)
     if match_index is None:
         print(f"Match #{match_id} not found.")
         return
@@ -431,22 +867,10 @@ def delete_match(ratings, match_history, match_counts, filename):
         print("Delete cancelled.")
         return
     
-    # Remove match
-    match_history.pop(match_index)
-    
-    # Renumber match IDs
-    for i, m in enumerate(match_history, 1):
-        m['match_id'] = i
-    
-    # Recalculate everything
-    new_ratings, new_counts = recalculate_all_ratings(match_history)
-    ratings.clear()
-    ratings.update(new_ratings)
-    match_counts.clear()
-    match_counts.update(new_counts)
-    
-    save_data(ratings, match_history, match_counts, filename)
+    remove_match(ratings, match_history, match_counts, match_index)
+    append_change({'op': 'delete', 'match_id': match_id}, filename)
     print("Match deleted and ratings recalculated.")
+    return True
 
 def edit_match(ratings, match_history, match_counts, filename):
     """Edits a specific match and recalculates ratings."""
@@ -462,13 +886,7 @@ def edit_match(ratings, match_history, match_counts, filename):
         print("Invalid input.")
         return
     
-    # Find match
-    match_index = None
-    for i, match in enumerate(match_history):
-        if match['match_id'] == match_id:
-            match_index = i
-            break
-    
+    match_index = find_match_index(match_history, match_id)
     if match_index is None:
         print(f"Match #{match_id} not found.")
         return
@@ -484,35 +902,32 @@ def edit_match(ratings, match_history, match_counts, filename):
     new_goals_b = input(f"Goals for {match['team_b']} (current: {match['goals_b']}): ").strip()
     
     try:
-        if new_goals_a:
-            match['goals_a'] = int(new_goals_a)
-        if new_goals_b:
-            match['goals_b'] = int(new_goals_b)
+        goals_a = int(new_goals_a) if new_goals_a else match['goals_a']
+        goals_b = int(new_goals_b) if new_goals_b else match['goals_b']
     except ValueError:
         print("Invalid input. Edit cancelled.")
         return
     
-    # Recalculate everything
-    new_ratings, new_counts = recalculate_all_ratings(match_history)
-    ratings.clear()
-    ratings.update(new_ratings)
-    match_counts.clear()
-    match_counts.update(new_counts)
+    if goals_a == match['goals_a'] and goals_b == match['goals_b']:
+        print("No changes made.")
+        return
     
-    save_data(ratings, match_history, match_counts, filename)
+    rescore_match(ratings, match_history, match_counts, match_index, goals_a, goals_b)
+    append_change({'op': 'edit', 'match_id': match_id, 'goals_a': goals_a, 'goals_b': goals_b}, filename)
     print("Match edited and ratings recalculated.")
+    return True
 
 def add_match_result(ratings, match_counts, match_history):
     """Prompts user for match details and updates ratings."""
     print("\n--- Add Match Result ---")
     
     while True:
-        team_a = input("Home team: ").strip()
+        team_a = sys.intern(input("Home team: ").strip())
         if team_a: break
         print("Team name cannot be empty.")
     
     while True:
-        team_b = input(f"Away team: ").strip()
+        team_b = sys.intern(input(f"Away team: ").strip())
         if team_b and team_b != team_a: break
         elif team_b == team_a: print("Teams must be different.")
         else: print("Team name cannot be empty.")
@@ -579,11 +994,8 @@ def predict_match(ratings, match_counts):
     matches_a = match_counts.get(team_a, 0)
     matches_b = match_counts.get(team_b, 0)
     
-    home_adv = 0
-    venue_type = "Neutral"
-    if is_home_a is True:
-        home_adv = HOME_ADVANTAGE
-        venue_type = f"{team_a} (Home)"
+    home_adv = _HOME_ADV[is_home_a]
+    venue_type = f"{team_a} (Home)" if is_home_a else "Neutral"
     
     # Calculate adjusted ratings
     adjusted_rating_a = rating_a + home_adv
@@ -595,14 +1007,7 @@ def predict_match(ratings, match_counts):
     expected_b = 1 - expected_a
     
     # Calculate draw probability
-    if abs_diff <= 100:
-        draw_prob = 0.27 - (abs_diff / 100) * 0.02
-    elif abs_diff <= 200:
-        draw_prob = 0.25 - ((abs_diff - 100) / 100) * 0.05
-    elif abs_diff <= 300:
-        draw_prob = 0.20 - ((abs_diff - 200) / 100) * 0.05
-    else:
-        draw_prob = max(0.15 - ((abs_diff - 300) / 200) * 0.05, 0.08)
+    draw_prob = _draw_prob(abs_diff)
     
     # Adjust win probabilities
     remaining_prob = 1.0 - draw_prob
@@ -642,21 +1047,14 @@ def backup_and_restore_menu(filename):
                 print("\nNo backups available.")
             else:
                 print(f"\nAvailable backups ({len(backups)}):")
-                for i, backup in enumerate(backups, 1):
-                    # Extract timestamp from filename
-                    timestamp = backup.replace('backup_', '').replace('.json', '')
-                    formatted = datetime.strptime(timestamp, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
-                    print(f"  {i}. {backup} ({formatted})")
+                sys.stdout.write(format_backup_list(backups))
         elif choice == '3':
             backups = list_backups()
             if not backups:
                 print("\nNo backups available.")
             else:
                 print(f"\nAvailable backups:")
-                for i, backup in enumerate(backups, 1):
-                    timestamp = backup.replace('backup_', '').replace('.json', '')
-                    formatted = datetime.strptime(timestamp, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
-                    print(f"  {i}. {backup} ({formatted})")
+                sys.stdout.write(format_backup_list(backups))
                 
                 try:
                     choice_num = int(input("\nEnter backup number to restore (0 to cancel): ").strip())
@@ -684,6 +1082,7 @@ def reset_championship(ratings, match_history, match_counts, filename):
         create_backup(filename)
         ratings.clear()
         match_history.clear()
+        mark_history_changed()
         match_counts.clear()
         save_data(ratings, match_history, match_counts, filename)
         print("Championship data has been reset. Backup created.")
@@ -710,7 +1109,7 @@ def rename_team(ratings, match_history, match_counts, filename):
             break
 
     while True:
-        new_name = input(f"Enter the NEW name for '{old_name}': ").strip()
+        new_name = sys.intern(input(f"Enter the NEW name for '{old_name}': ").strip())
         if not new_name:
             print("New name cannot be empty.")
         elif new_name == old_name:
@@ -727,120 +1126,195 @@ def rename_team(ratings, match_history, match_counts, filename):
         ratings[new_name] = rating
         match_counts[new_name] = matches
         
-        # Update match history
-        for match in match_history:
+        # Update only the matches this team played in
+        team_index = get_team_index(match_history)
+        indices = team_index.pop(old_name, [])
+        for i in indices:
+            match = match_history[i]
             if match['team_a'] == old_name:
                 match['team_a'] = new_name
             if match['team_b'] == old_name:
                 match['team_b'] = new_name
+        team_index[new_name] = indices
         
-        save_data(ratings, match_history, match_counts, filename)
-        print(f"\nSuccessfully renamed '{old_name}' to '{new_name}'.")
-        print(f"Rating: {rating:.1f}, Matches: {matches}")
-        print(f"Updated {len(match_history)} match records.")
-    except Exception as e:
-        print(f"Error during rename: {e}")
-
-def rename_team(ratings, match_history, match_counts, filename):
-    """Renames a team while preserving all data and updating match history."""
-    if not ratings:
-        print("\nNo teams exist yet to rename.")
-        return
-
-    while True:
-        old_name = input("Enter the CURRENT name of the team: ").strip()
-        if not old_name:
-            print("Team name cannot be empty.")
-            continue
-        if old_name not in ratings:
-            print(f"Error: Team '{old_name}' not found.")
-            if input("Try again? (yes/no): ").lower().strip() != 'yes':
-                print("Rename cancelled.")
-                return
-        else:
-            break
-
-    while True:
-        new_name = input(f"Enter the NEW name for '{old_name}': ").strip()
-        if not new_name:
-            print("New name cannot be empty.")
-        elif new_name == old_name:
-            print("New name must be different.")
-        elif new_name in ratings:
-            print(f"Error: Team '{new_name}' already exists.")
-        else:
-            break
-
-    try:
-        # Update ratings and match counts
-        rating = ratings.pop(old_name)
-        matches = match_counts.pop(old_name, 0)
-        ratings[new_name] = rating
-        match_counts[new_name] = matches
-        
-        # Update match history
-        for match in match_history:
-            if match['team_a'] == old_name:
-                match['team_a'] = new_name
-            if match['team_b'] == old_name:
-                match['team_b'] = new_name
+        # Other cached views must be rebuilt; the team index was updated above
+        mark_history_changed()
+        _team_index_cache['version'] = _history_version
         
         save_data(ratings, match_history, match_counts, filename)
         print(f"\nSuccessfully renamed '{old_name}' to '{new_name}'.")
         print(f"Rating: {rating:.1f}, Matches: {matches}")
-        print(f"Updated {len(match_history)} match records.")
+        print(f"Updated {len(indices)} match records.")
     except Exception as e:
         print(f"Error during rename: {e}")
 
 # --- League Standings Functions ---
 
+_standings_cache = {'history': None, 'version': None, 'length': 0, 'last': None, 'standings': None, 'order': None}
+
 def calculate_league_standings(match_history):
+    """
+    Returns current league standings, cached until the match history changes.
+    The returned dict is shared between callers and must not be modified.
+    Appended, removed or replaced records are noticed; code that changes
+    an existing record in place must call mark_history_changed() after.
+    """
+    cache = _standings_cache
+    length = len(match_history)
+    seen = cache['length']
+    # The last record the table was built from must still be in its place,
+    # which catches matches removed and others appended in their stead
+    if cache['history'] is not match_history or cache['version'] != _history_version \
+            or seen > length or (seen and match_history[seen - 1] is not cache['last']):
+        cache.update(history=match_history, version=_history_version, length=length,
+                     last=match_history[-1] if length else None,
+                     standings=compute_league_standings(match_history), order=None)
+    elif seen < length:
+        # Matches were only appended: fold the new ones into the cached table
+        add_to_league_standings(cache['standings'], match_history[seen:])
+        cache.update(length=length, last=match_history[-1], order=None)
+    return cache['standings']
+
+def calculate_league_order(match_history):
+    """
+    Returns team names in table order (points, goal difference, goals scored),
+    cached alongside the standings they were sorted from.
+    """
+    standings = calculate_league_standings(match_history)
+    cache = _standings_cache
+    if cache['order'] is None:
+        cache['order'] = sorted(
+            standings,
+            key=lambda team: (
+                standings[team]['points'],
+                standings[team]['goals_for'] - standings[team]['goals_against'],
+                standings[team]['goals_for']
+            ),
+            reverse=True
+        )
+    return cache['order']
+
+def compute_league_standings(match_history):
     """
     Calculates current league standings from match history.
     Returns dict with team stats: points, wins, draws, losses, goals_for, goals_against, matches_played
     """
-    standings = defaultdict(lambda: {
-        'points': 0,
-        'wins': 0,
-        'draws': 0,
-        'losses': 0,
-        'goals_for': 0,
-        'goals_against': 0,
-        'matches_played': 0
-    })
-    
-    for match in match_history:
+    teams, idx_a, idx_b, goals_a, goals_b = history_columns(match_history)
+    n_teams = len(teams)
+    
+    # Per-team accumulators indexed by team id
+    points = [0] * n_teams
+    wins = [0] * n_teams
+    draws = [0] * n_teams
+    losses = [0] * n_teams
+    goals_for = [0] * n_teams
+    goals_against = [0] * n_teams
+    
+    for ia, ib, ga, gb in zip(idx_a, idx_b, goals_a, goals_b):
+        # Update goals
+        goals_for[ia] += ga
+        goals_against[ia] += gb
+        goals_for[ib] += gb
+        goals_against[ib] += ga
+        
+        # Update points and results
+        if ga > gb:
+            points[ia] += 3
+            wins[ia] += 1
+            losses[ib] += 1
+        elif gb > ga:
+            points[ib] += 3
+            wins[ib] += 1
+            losses[ia] += 1
+        else:
+            points[ia] += 1
+            draws[ia] += 1
+            points[ib] += 1
+            draws[ib] += 1
+    
+    return {
+        team: {
+            'points': points[i],
+            'wins': wins[i],
+            'draws': draws[i],
+            'losses': losses[i],
+            'goals_for': goals_for[i],
+            'goals_against': goals_against[i],
+            'matches_played': wins[i] + draws[i] + losses[i]
+        }
+        for i, team in enumerate(teams)
+    }
+
+def add_to_league_standings(standings, matches, sign=1):
+    """
+    Adds the results of matches to standings in place, or takes them out
+    again with sign=-1.
+    """
+    for match in matches:
         team_a = match['team_a']
         team_b = match['team_b']
         goals_a = match['goals_a']
         goals_b = match['goals_b']
         
-        # Update match counts
-        standings[team_a]['matches_played'] += 1
-        standings[team_b]['matches_played'] += 1
+        for team in (team_a, team_b):
+            if team not in standings:
+                standings[team] = {
+                    'points': 0, 'wins': 0, 'draws': 0, 'losses': 0,
+                    'goals_for': 0, 'goals_against': 0, 'matches_played': 0
+                }
+        stats_a = standings[team_a]
+        stats_b = standings[team_b]
         
         # Update goals
-        standings[team_a]['goals_for'] += goals_a
-        standings[team_a]['goals_against'] += goals_b
-        standings[team_b]['goals_for'] += goals_b
-        standings[team_b]['goals_against'] += goals_a
+        stats_a['goals_for'] += goals_a * sign
+        stats_a['goals_against'] += goals_b * sign
+        stats_b['goals_for'] += goals_b * sign
+        stats_b['goals_against'] += goals_a * sign
+        stats_a['matches_played'] += sign
+        stats_b['matches_played'] += sign
         
         # Update points and results
         if goals_a > goals_b:
-            standings[team_a]['points'] += 3
-            standings[team_a]['wins'] += 1
-            standings[team_b]['losses'] += 1
+            stats_a['points'] += 3 * sign
+            stats_a['wins'] += sign
+            stats_b['losses'] += sign
         elif goals_b > goals_a:
-            standings[team_b]['points'] += 3
-            standings[team_b]['wins'] += 1
-            standings[team_a]['losses'] += 1
+            stats_b['points'] += 3 * sign
+            stats_b['wins'] += sign
+            stats_a['losses'] += sign
         else:
-            standings[team_a]['points'] += 1
-            standings[team_a]['draws'] += 1
-            standings[team_b]['points'] += 1
-            standings[team_b]['draws'] += 1
+            stats_a['points'] += sign
+            stats_a['draws'] += sign
+            stats_b['points'] += sign
+            stats_b['draws'] += sign
+
+def patch_league_standings(match_history, removed=(), added=()):
+    """
+    Carries the cached standings across an in-place change to match_history
+    instead of rebuilding them: results in removed are taken out and results
+    in added put in. Call right after mark_history_changed().
+    """
+    cache = _standings_cache
+    # Only a table that was up to date with the history before the change
+    if (cache['history'] is not match_history or cache['version'] != _history_version - 1
+            or cache['length'] - len(removed) + len(added) != len(match_history)):
+        return
     
-    return dict(standings)
+    # A team losing all its matches would have to leave the table and, if
+    # it comes back, re-enter it in a different place than a rebuild puts
+    # it; the stale version makes the next read rebuild instead
+    removals = Counter()
+    for match in removed:
+        removals[match['team_a']] += 1
+        removals[match['team_b']] += 1
+    standings = cache['standings']
+    if any(standings[team]['matches_played'] <= count for team, count in removals.items()):
+        return
+    
+    add_to_league_standings(cache['standings'], removed, -1)
+    add_to_league_standings(cache['standings'], added)
+    cache.update(version=_history_version, length=len(match_history),
+                 last=match_history[-1] if match_history else None, order=None)
 
 def display_league_table(match_history, ratings):
     """Displays the current league standings table."""
@@ -850,61 +1324,50 @@ def display_league_table(match_history, ratings):
     
     standings = calculate_league_standings(match_history)
     
-    # Sort by points, then goal difference, then goals scored
-    sorted_standings = sorted(
-        standings.items(),
-        key=lambda x: (
-            x[1]['points'],
-            x[1]['goals_for'] - x[1]['goals_against'],
-            x[1]['goals_for']
-        ),
-        reverse=True
-    )
-    
-    print("\n" + "="*95)
-    print("LEAGUE STANDINGS")
-    print("="*95)
-    print(f"{'Pos':<4} {'Team':<22} {'MP':<4} {'W':<3} {'D':<3} {'L':<3} {'GF':<4} {'GA':<4} {'GD':<5} {'Pts':<4} {'Elo':<7}")
-    print("-" * 95)
-    
-    for pos, (team, stats) in enumerate(sorted_standings, 1):
+    # Sorted by points, then goal difference, then goals scored
+    table_order = calculate_league_order(match_history)
+    
+    # Build the whole table first and write it out in one go
+    lines = [
+        "\n" + "="*95,
+        "LEAGUE STANDINGS",
+        "="*95,
+        f"{'Pos':<4} {'Team':<22} {'MP':<4} {'W':<3} {'D':<3} {'L':<3} {'GF':<4} {'GA':<4} {'GD':<5} {'Pts':<4} {'Elo':<7}",
+        "-" * 95,
+    ]
+    for pos, team in enumerate(table_order, 1):
+        stats = standings[team]
         gd = stats['goals_for'] - stats['goals_against']
         elo = ratings.get(team, INITIAL_RATING)
-        print(f"{pos:<4} {team:<22} {stats['matches_played']:<4} {stats['wins']:<3} "
-              f"{stats['draws']:<3} {stats['losses']:<3} {stats['goals_for']:<4} "
-              f"{stats['goals_against']:<4} {gd:+5} {stats['points']:<4} {elo:<7.1f}")
+        lines.append(f"{pos:<4} {team:<22} {stats['matches_played']:<4} {stats['wins']:<3} "
+                     f"{stats['draws']:<3} {stats['losses']:<3} {stats['goals_for']:<4} "
+                     f"{stats['goals_against']:<4} {gd:+5} {stats['points']:<4} {elo:<7.1f}")
+    lines.append("-" * 95)
+    lines.append("MP=Matches Played, W=Wins, D=Draws, L=Losses, GF=Goals For, GA=Goals Against, GD=Goal Difference\n")
     
-    print("-" * 95)
-    print("MP=Matches Played, W=Wins, D=Draws, L=Losses, GF=Goals For, GA=Goals Against, GD=Goal Difference\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def generate_remaining_fixtures(match_history, all_teams):
     """
     Generates list of remaining fixtures based on round-robin format.
     Each team plays every other team twice (home and away).
     """
-    # Track matches already played
-    played_matches = set()
-    for match in match_history:
-        team_a = match['team_a']
-        team_b = match['team_b']
-        # Store as (home, away) tuple
-        played_matches.add((team_a, team_b))
-    
-    # Generate all possible fixtures (home and away)
-    remaining_fixtures = []
-    for i, team_a in enumerate(all_teams):
-        for team_b in all_teams:
-            if team_a != team_b:
-                # Check if this fixture (home/away) has been played
-                if (team_a, team_b) not in played_matches:
-                    remaining_fixtures.append((team_a, team_b))
+    # Track matches already played as (home, away) pairs, pulled out of
+    # the records column-wise without a Python-level loop
+    played_matches = set(map(itemgetter('team_a', 'team_b'), match_history))
+    
+    # Every ordered pair is a fixture; keep the unplayed ones in table order
+    remaining_fixtures = [
+        fixture for fixture in permutations(all_teams, 2)
+        if fixture not in played_matches
+    ]
     
     return remaining_fixtures
 
-def simulate_match(rating_a, rating_b, is_home_a):
+def match_probabilities(rating_a, rating_b, is_home_a):
     """
-    Simulates a single match outcome based on Elo ratings.
-    Returns (goals_a, goals_b, points_a, points_b)
+    Returns (win_a, draw) probabilities for a simulated match.
+    Team B wins with the remaining probability.
     """
     home_adv = HOME_ADVANTAGE if is_home_a else 0
     adjusted_rating_a = rating_a + home_adv
@@ -912,151 +1375,243 @@ def simulate_match(rating_a, rating_b, is_home_a):
     abs_diff = abs(rating_diff)
     
     # Calculate probabilities
-    expected_a = 1 / (1 + math.pow(10, (rating_b - adjusted_rating_a) / 400))
-    expected_b = 1 - expected_a
-    
-    # Draw probability
-    if abs_diff <= 100:
-        draw_prob = 0.27 - (abs_diff / 100) * 0.02
-    elif abs_diff <= 200:
-        draw_prob = 0.25 - ((abs_diff - 100) / 100) * 0.05
-    elif abs_diff <= 300:
-        draw_prob = 0.20 - ((abs_diff - 200) / 100) * 0.05
-    else:
-        draw_prob = max(0.15 - ((abs_diff - 300) / 200) * 0.05, 0.08)
+    expected_a = calculate_expected_score(rating_a, rating_b, home_adv)
     
-    remaining_prob = 1.0 - draw_prob
-    win_a = expected_a * remaining_prob
-    win_b = expected_b * remaining_prob
+    draw_prob = _draw_prob(abs_diff)
     
-    # Simulate outcome
-    rand = random.random()
-    if rand < win_a:
-        # Team A wins - generate realistic scoreline
-        goals_a = random.choices([1, 2, 3, 4, 5], weights=[30, 35, 20, 10, 5])[0]
-        goals_b = random.choices([0, 1, 2], weights=[50, 35, 15])[0]
-        if goals_a <= goals_b:
-            goals_a = goals_b + 1
-        return goals_a, goals_b, 3, 0
-    elif rand < win_a + draw_prob:
-        # Draw
-        goals = random.choices([0, 1, 2, 3], weights=[20, 40, 30, 10])[0]
-        return goals, goals, 1, 1
-    else:
-        # Team B wins
-        goals_b = random.choices([1, 2, 3, 4, 5], weights=[30, 35, 20, 10, 5])[0]
-        goals_a = random.choices([0, 1, 2], weights=[50, 35, 15])[0]
-        if goals_b <= goals_a:
-            goals_b = goals_a + 1
-        return goals_a, goals_b, 0, 3
-
-def simulate_season(standings, ratings, remaining_fixtures, num_simulations=10000):
+    win_a = expected_a * (1.0 - draw_prob)
+    return win_a, draw_prob
+
+def scoreline_distribution(win_a, draw_prob):
+    """
+    Returns every simulated scoreline for the given outcome probabilities,
+    as a {(goals_a, goals_b): probability} dict. The winner's and loser's
+    goals are drawn independently, and the winner always scores at least
+    one more.
+    """
+    def probabilities(goals, cum_weights):
+        total = cum_weights[-1]
+        return zip(goals, [(high - low) / total for low, high in zip([0] + cum_weights, cum_weights)])
+    
+    distribution = defaultdict(float)
+    for winner_goals, winner_prob in probabilities(_WINNER_GOALS, _WINNER_CUM_WEIGHTS):
+        for loser_goals, loser_prob in probabilities(_LOSER_GOALS, _LOSER_CUM_WEIGHTS):
+            goals = max(winner_goals, loser_goals + 1)
+            distribution[goals, loser_goals] += win_a * winner_prob * loser_prob
+            distribution[loser_goals, goals] += (1.0 - win_a - draw_prob) * winner_prob * loser_prob
+    for goals, prob in probabilities(_DRAW_GOALS, _DRAW_CUM_WEIGHTS):
+        distribution[goals, goals] += draw_prob * prob
+    return dict(distribution)
+
+def simulate_season(standings, ratings, remaining_fixtures, num_simulations=10000, workers=None, seed=None):
     """
     Runs Monte Carlo simulation of remaining season.
-    Returns statistics about final positions for each team.
+    Returns statistics about final positions for each team: per team, a list
+    of finishing counts indexed by position (index 0 unused) and an array of
+    final points per simulation.
+    Simulations are split across worker processes (default: one per CPU)
+    when the run is big enough to pay for starting them. Pass seed for a
+    reproducible run; otherwise the global random generator seeds it.
     """
     all_teams = list(standings.keys())
-    position_counts = {team: defaultdict(int) for team in all_teams}
-    points_distribution = {team: [] for team in all_teams}
     
-    print(f"\nRunning {num_simulations} season simulations...")
+    # Index teams and lay the fixtures out as parallel columns so the
+    # simulation loop works on lists instead of nested dicts
+    team_ids = {team: i for i, team in enumerate(all_teams)}
+    home_ids = [team_ids[team_a] for team_a, _ in remaining_fixtures]
+    away_ids = [team_ids[team_b] for _, team_b in remaining_fixtures]
+    team_ratings = [ratings.get(team, INITIAL_RATING) for team in all_teams]
+    
+    # Ratings are fixed for the whole run, so each fixture's outcome
+    # thresholds are computed once: home win below the first, draw below
+    # the second, away win otherwise
+    fixtures = []
+    for a, b in zip(home_ids, away_ids):
+        win_a, draw_prob = match_probabilities(team_ratings[a], team_ratings[b], True)
+        fixtures.append((a, b, win_a, win_a + draw_prob))
+    
+    init_state = (
+        [standings[team]['points'] for team in all_teams],
+        [standings[team]['goals_for'] for team in all_teams],
+        [standings[team]['goals_against'] for team in all_teams]
+    )
+    
+    # Final points fit in 16 bits for any realistic league, which halves the
+    # memory and the data workers send back; fall back to 32 bits otherwise
+    max_points = max(init_state[0], default=0) + 3 * len(fixtures)
+    points_type = 'H' if max_points <= 0xFFFF else 'i'
+    
+    # Simulations run in fixed-size chunks, each with its own seed drawn up
+    # front. Worker processes never replay the same random stream, and a
+    # given seed reproduces the run whatever the number of workers.
+    seeder = random.Random(seed) if seed is not None else random
+    chunk_sizes = [SIMULATION_CHUNK_SIZE] * (num_simulations // SIMULATION_CHUNK_SIZE)
+    if num_simulations % SIMULATION_CHUNK_SIZE:
+        chunk_sizes.append(num_simulations % SIMULATION_CHUNK_SIZE)
+    tasks = [(seeder.getrandbits(64), size, fixtures, init_state, points_type) for size in chunk_sizes]
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if num_simulations * len(fixtures) < PARALLEL_MIN_MATCHES:
+        workers = 1
+    workers = min(workers, len(tasks))
+    
+    results = None
+    if workers > 1:
+        try:
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_simulate_chunk, tasks)
+        except OSError:
+            results = None  # No worker processes available here: run serially
+    if results is None:
+        results = list(map(_simulate_chunk, tasks))
+    
+    # Merge the chunks back into per-team statistics
+    position_counts = {team: [0] * (len(all_teams) + 1) for team in all_teams}
+    points_distribution = {team: array(points_type) for team in all_teams}
+    for chunk_positions, chunk_points in results:
+        for i, team in enumerate(all_teams):
+            position_counts[team] = list(map(add, position_counts[team], chunk_positions[i]))
+            points_distribution[team].extend(chunk_points[i])
+    
+    return position_counts, points_distribution
+
+def _simulate_chunk(task):
+    """
+    Simulates one chunk of seasons for simulate_season.
+    task is (seed, num_simulations, fixtures, (points, goals_for, goals_against),
+    points array typecode).
+    Returns per-team-id position counts and final points arrays.
+    """
+    seed, num_simulations, fixtures, (init_points, init_goals_for, init_goals_against), points_type = task
+    n_teams = len(init_points)
+    # position_counts[team_id][position], position 0 unused
+    position_counts = [[0] * (n_teams + 1) for _ in range(n_teams)]
+    # Final points per simulation, preallocated as compact int arrays
+    points_columns = [array(points_type, [0]) * num_simulations for _ in range(n_teams)]
+    
+    rand_float = random.Random(seed).random
+    
+    # The run's teams and fixtures are fixed, so each team's whole table
+    # state packs into one integer that orders like (points, goal
+    # difference, goals for): no team can reach goal_span goals for (at
+    # most 5 per simulated match), so
+    #   key = points * point_unit + goals_for * (goal_span + 1)
+    #         - goals_against * goal_span + goal_span ** 2
+    # with the goal terms always inside [0, point_unit)
+    goal_span = sum(init_goals_for) + 5 * len(fixtures) + 1
+    point_unit = 2 * goal_span * goal_span
+    init_keys = [
+        pts * point_unit + gf * (goal_span + 1) - ga * goal_span + goal_span * goal_span
+        for pts, gf, ga in zip(init_points, init_goals_for, init_goals_against)
+    ]
+    
+    # Each fixture's whole result distribution, as cumulative probabilities
+    # of its scorelines and the key change each scoreline brings both teams,
+    # so a simulated match costs one random number and one bisect
+    outcome_tables = []
+    for a, b, win_a, win_or_draw in fixtures:
+        distribution = scoreline_distribution(win_a, win_or_draw - win_a)
+        cum_probs = list(accumulate(distribution.values()))
+        cum_probs[-1] = 1.0  # random() < 1.0, so rounding can't fall off the end
+        deltas = []
+        for goals_a, goals_b in distribution:
+            points_a, points_b = (3, 0) if goals_a > goals_b else (0, 3) if goals_b > goals_a else (1, 1)
+            margin = (goals_a - goals_b) * goal_span
+            deltas.append((points_a * point_unit + margin + goals_a,
+                           points_b * point_unit - margin + goals_b))
+        outcome_tables.append((a, b, cum_probs, deltas))
+    team_range = range(n_teams)
+    
+    # Per-simulation buffer, reset in place from the current standings
+    keys = [0] * n_teams
     
     for sim in range(num_simulations):
         # Start with current standings
-        sim_standings = {
-            team: {
-                'points': standings[team]['points'],
-                'goals_for': standings[team]['goals_for'],
-                'goals_against': standings[team]['goals_against']
-            }
-            for team in all_teams
-        }
+        keys[:] = init_keys
         
-        # Simulate all remaining fixtures
-        for team_a, team_b in remaining_fixtures:
-            rating_a = ratings.get(team_a, INITIAL_RATING)
-            rating_b = ratings.get(team_b, INITIAL_RATING)
-            
-            goals_a, goals_b, pts_a, pts_b = simulate_match(rating_a, rating_b, is_home_a=True)
-            
-            sim_standings[team_a]['points'] += pts_a
-            sim_standings[team_a]['goals_for'] += goals_a
-            sim_standings[team_a]['goals_against'] += goals_b
-            
-            sim_standings[team_b]['points'] += pts_b
-            sim_standings[team_b]['goals_for'] += goals_b
-            sim_standings[team_b]['goals_against'] += goals_a
+        # Simulate all remaining fixtures, drawing each scoreline by
+        # inverse CDF from the fixture's table
+        for a, b, cum_probs, deltas in outcome_tables:
+            delta_a, delta_b = deltas[bisect(cum_probs, rand_float())]
+            keys[a] += delta_a
+            keys[b] += delta_b
         
-        # Sort final standings
-        final_standings = sorted(
-            sim_standings.items(),
-            key=lambda x: (
-                x[1]['points'],
-                x[1]['goals_for'] - x[1]['goals_against'],
-                x[1]['goals_for']
-            ),
-            reverse=True
-        )
+        # Sort final standings on the packed keys
+        final_order = sorted(team_range, key=keys.__getitem__, reverse=True)
         
         # Record positions and points
-        for pos, (team, stats) in enumerate(final_standings, 1):
-            position_counts[team][pos] += 1
-            if sim == 0 or len(points_distribution[team]) < num_simulations:
-                points_distribution[team].append(stats['points'])
+        for pos, i in enumerate(final_order, 1):
+            position_counts[i][pos] += 1
+            points_columns[i][sim] = keys[i] // point_unit
     
-    return position_counts, points_distribution
+    return position_counts, points_columns
 
-def display_season_prediction(match_history, ratings):
-    """Displays predicted final standings based on Monte Carlo simulation."""
-    if not match_history:
-        print("\nNo matches played yet.")
-        return
-    
+def default_simulation_count(num_fixtures):
+    """
+    Returns the number of season simulations to run, sized so each run
+    simulates about the same number of matches however much of the season is left.
+    """
+    return max(MIN_SIMULATIONS, min(MAX_SIMULATIONS, SIMULATION_MATCH_BUDGET // max(1, num_fixtures)))
+
+def compute_season_prediction(match_history, ratings, num_simulations=None, workers=None, seed=None,
+                              remaining_fixtures=None):
+    """
+    Simulates the rest of the season and returns the predicted final standings
+    without printing anything.
+    Returns {'num_simulations': int, 'teams': {team: stats}} with teams ordered
+    by expected final position. Pass remaining_fixtures if already generated.
+    With no fixtures left the current table is final and nothing is simulated.
+    """
     standings = calculate_league_standings(match_history)
     all_teams = list(standings.keys())
-    
     if len(all_teams) < 2:
-        print("\nNeed at least 2 teams to predict season outcome.")
-        return
-    
-    # Calculate total matches per team in full season
-    total_matches_per_team = (len(all_teams) - 1) * 2
-    matches_played = standings[all_teams[0]]['matches_played']
-    
-    print(f"\nChampionship: {len(all_teams)} teams")
-    print(f"Season format: {total_matches_per_team} matches per team (home and away)")
-    print(f"Progress: {matches_played}/{total_matches_per_team} matches played")
-    
-    if matches_played >= total_matches_per_team:
-        print("\nSeason complete! Final standings:")
-        display_league_table(match_history, ratings)
-        return
+        raise ValueError("need at least 2 teams to predict season outcome")
+    
+    if remaining_fixtures is None:
+        remaining_fixtures = generate_remaining_fixtures(match_history, all_teams)
+    if not remaining_fixtures:
+        teams = {}
+        for pos, team in enumerate(calculate_league_order(match_history), 1):
+            points = standings[team]['points']
+            teams[team] = {
+                'current_points': points,
+                'expected_position': float(pos),
+                'most_likely_position': pos,
+                'champion_probability': 100.0 if pos == 1 else 0.0,
+                'top5_probability': 100.0 if pos <= 5 else 0.0,
+                'expected_points': float(points),
+                'points_range': (points, points),
+                'current_position': pos
+            }
+        return {'num_simulations': 0, 'teams': teams}
     
-    # Generate remaining fixtures
-    remaining_fixtures = generate_remaining_fixtures(match_history, all_teams)
-    print(f"Remaining fixtures: {len(remaining_fixtures)}")
+    if num_simulations is None:
+        num_simulations = default_simulation_count(len(remaining_fixtures))
+    position_counts, points_dist = simulate_season(standings, ratings, remaining_fixtures,
+                                                   num_simulations, workers, seed)
     
-    # Run simulation
-    num_sims = 10000
-    position_counts, points_dist = simulate_season(standings, ratings, remaining_fixtures, num_sims)
+    # Current positions come from the cached league table order
+    current_positions = {team: pos for pos, team in enumerate(calculate_league_order(match_history), 1)}
     
     # Calculate statistics
     prediction_stats = {}
+    expected_order = []
     for team in all_teams:
         positions = position_counts[team]
         points = points_dist[team]
         
         # Expected position (weighted average)
-        exp_pos = sum(pos * count for pos, count in positions.items()) / num_sims
+        exp_pos = sum(pos * count for pos, count in enumerate(positions)) / num_simulations
         
         # Most likely position
-        most_likely_pos = max(positions.items(), key=lambda x: x[1])[0]
+        most_likely_pos = max(range(1, len(positions)), key=positions.__getitem__)
         
         # Championship probability (finishing 1st)
-        champion_prob = (positions.get(1, 0) / num_sims) * 100
+        champion_prob = (positions[1] / num_simulations) * 100
         
         # Top 5 probability
-        top5_prob = sum(positions.get(pos, 0) for pos in [1, 2, 3, 4, 5]) / num_sims * 100
+        top5_prob = sum(positions[1:6]) / num_simulations * 100
         
         # Expected points
         exp_points = sum(points) / len(points)
@@ -1071,45 +1626,84 @@ def display_season_prediction(match_history, ratings):
             'top5_probability': top5_prob,
             'expected_points': exp_points,
             'points_range': (min_points, max_points),
-            'current_position': 0  # Will be filled below
+            'current_position': current_positions[team]
         }
-    
-    # Add current positions
-    sorted_current = sorted(
-        standings.items(),
-        key=lambda x: (x[1]['points'], x[1]['goals_for'] - x[1]['goals_against']),
-        reverse=True
-    )
-    for pos, (team, _) in enumerate(sorted_current, 1):
-        prediction_stats[team]['current_position'] = pos
-    
-    # Display predictions
-    print("\n" + "="*100)
-    print("PREDICTED FINAL STANDINGS")
-    print(f"Based on {num_sims:,} Monte Carlo simulations")
-    print("="*100)
-    print(f"{'Team':<22} {'Curr':<5} {'Pts':<4} {'Pred':<6} {'Title':<8} {'Top 5':<8} {'Final':<8} {'Range':<12}")
-    print(f"{'':22} {'Pos':<5} {'Now':<4} {'Pos':<6} {'%':<8} {'%':<8} {'Pts':<8} {'(Min-Max)':<12}")
-    print("-" * 100)
+        expected_order.append((exp_pos, team))
     
     # Sort by expected position
-    sorted_predictions = sorted(
-        prediction_stats.items(),
-        key=lambda x: x[1]['expected_position']
-    )
+    expected_order.sort(key=itemgetter(0))
     
-    for team, stats in sorted_predictions:
-        print(f"{team:<22} {stats['current_position']:<5} {stats['current_points']:<4} "
-              f"{stats['expected_position']:<6.1f} {stats['champion_probability']:<8.1f} "
-              f"{stats['top5_probability']:<8.1f} {stats['expected_points']:<8.1f} "
-              f"{stats['points_range'][0]}-{stats['points_range'][1]}")
+    return {
+        'num_simulations': num_simulations,
+        'teams': {team: prediction_stats[team] for _, team in expected_order}
+    }
+
+def display_season_prediction(match_history, ratings):
+    """Displays predicted final standings based on Monte Carlo simulation."""
+    if not match_history:
+        print("\nNo matches played yet.")
+        return
+    
+    standings = calculate_league_standings(match_history)
+    all_teams = list(standings.keys())
+    
+    if len(all_teams) < 2:
+        print("\nNeed at least 2 teams to predict season outcome.")
+        return
+    
+    # Calculate total matches per team in full season
+    total_matches_per_team = (len(all_teams) - 1) * 2
+    matches_played = standings[all_teams[0]]['matches_played']
+    
+    print(f"\nChampionship: {len(all_teams)} teams")
+    print(f"Season format: {total_matches_per_team} matches per team (home and away)")
+    print(f"Progress: {matches_played}/{total_matches_per_team} matches played")
     
-    print("-" * 100)
-    print("\nNote: Predictions based on current Elo ratings and home advantage\n")
+    # Generate remaining fixtures
+    remaining_fixtures = generate_remaining_fixtures(match_history, all_teams)
+    
+    if matches_played >= total_matches_per_team or not remaining_fixtures:
+        print("\nSeason complete! Final standings:")
+        display_league_table(match_history, ratings)
+        return
+    
+    print(f"Remaining fixtures: {len(remaining_fixtures)}")
+    
+    # Run simulation
+    num_sims = default_simulation_count(len(remaining_fixtures))
+    print(f"\nRunning {num_sims} season simulations...")
+    prediction = compute_season_prediction(match_history, ratings, num_sims,
+                                           remaining_fixtures=remaining_fixtures)
+    
+    # Build the whole table first and write it out in one go
+    lines = [
+        "\n" + "="*100,
+        "PREDICTED FINAL STANDINGS",
+        f"Based on {num_sims:,} Monte Carlo simulations",
+        "="*100,
+        f"{'Team':<22} {'Curr':<5} {'Pts':<4} {'Pred':<6} {'Title':<8} {'Top 5':<8} {'Final':<8} {'Range':<12}",
+        f"{'':22} {'Pos':<5} {'Now':<4} {'Pos':<6} {'%':<8} {'%':<8} {'Pts':<8} {'(Min-Max)':<12}",
+        "-" * 100,
+    ]
+    for team, stats in prediction['teams'].items():
+        lines.append(f"{team:<22} {stats['current_position']:<5} {stats['current_points']:<4} "
+                     f"{stats['expected_position']:<6.1f} {stats['champion_probability']:<8.1f} "
+                     f"{stats['top5_probability']:<8.1f} {stats['expected_points']:<8.1f} "
+                     f"{stats['points_range'][0]}-{stats['points_range'][1]}")
+    lines.append("-" * 100)
+    lines.append("\nNote: Predictions based on current Elo ratings and home advantage\n")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # --- Main Program ---
 def main():
     team_ratings, match_history, match_counts = load_data(JSON_FILENAME)
+    
+    # Fold any journal left over from the last session into the data file
+    if os.path.exists(journal_path(JSON_FILENAME)):
+        create_backup(JSON_FILENAME)
+        save_data(team_ratings, match_history, match_counts, JSON_FILENAME)
+    unsaved_changes = 0
 
     print("\n" + "="*70)
     print("ELO CHAMPIONSHIP RATING SYSTEM")
@@ -1135,10 +1729,18 @@ def main():
 
         if choice == '1':
             add_match_result(team_ratings, match_counts, match_history)
-            create_backup(JSON_FILENAME)
-            save_data(team_ratings, match_history, match_counts, JSON_FILENAME)
+            append_match(match_history[-1], JSON_FILENAME)
+            unsaved_changes += 1
         elif choice == '2':
-            display_rankings(team_ratings, match_counts)
+            top = input("Number of teams to show (press Enter for all): ").strip()
+            try:
+                limit = int(top) if top else None
+            except ValueError:
+                limit = 0
+            if limit is not None and limit < 1:
+                print("Invalid input.")
+            else:
+                display_rankings(team_ratings, match_counts, limit)
         elif choice == '3':
             display_league_table(match_history, team_ratings)
         elif choice == '4':
@@ -1146,23 +1748,33 @@ def main():
         elif choice == '5':
             display_match_history(match_history, limit=20)
         elif choice == '6':
-            undo_last_match(team_ratings, match_history, match_counts, JSON_FILENAME)
+            if undo_last_match(team_ratings, match_history, match_counts, JSON_FILENAME):
+                unsaved_changes += 1
         elif choice == '7':
-            edit_match(team_ratings, match_history, match_counts, JSON_FILENAME)
+            if edit_match(team_ratings, match_history, match_counts, JSON_FILENAME):
+                unsaved_changes += 1
         elif choice == '8':
-            delete_match(team_ratings, match_history, match_counts, JSON_FILENAME)
+            if delete_match(team_ratings, match_history, match_counts, JSON_FILENAME):
+                unsaved_changes += 1
         elif choice == '9':
             if len(team_ratings) >= 2:
                 predict_match(team_ratings, match_counts)
             else:
                 print("Need at least 2 teams with ratings to predict.")
         elif choice == '10':
+            # Backups only cover the data file, so fold the journal in first
+            if unsaved_changes:
+                save_data(team_ratings, match_history, match_counts, JSON_FILENAME)
+                unsaved_changes = 0
             should_reload = backup_and_restore_menu(JSON_FILENAME)
             if should_reload:
                 team_ratings, match_history, match_counts = load_data(JSON_FILENAME)
         elif choice == '11':
             rename_team(team_ratings, match_history, match_counts, JSON_FILENAME)
         elif choice == '12':
+            if unsaved_changes:
+                save_data(team_ratings, match_history, match_counts, JSON_FILENAME)
+                unsaved_changes = 0
             reset_championship(team_ratings, match_history, match_counts, JSON_FILENAME)
         elif choice == '13':
             create_backup(JSON_FILENAME)
@@ -1172,6 +1784,12 @@ def main():
             break
         else:
             print("Invalid choice.")
+        
+        # Periodically compact the journal into the data file
+        if unsaved_changes >= JOURNAL_COMPACT_EVERY:
+            create_backup(JSON_FILENAME)
+            save_data(team_ratings, match_history, match_counts, JSON_FILENAME)
+            unsaved_changes = 0
 
 if __name__ == "__main__":
     main()
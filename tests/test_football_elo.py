@@ -0,0 +1,367 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import football_elo as fe
+
+
+def build_history(results):
+    """Records (team_a, team_b, goals_a, goals_b) results and returns the state."""
+    ratings, match_counts, match_history = {}, {}, []
+    for team_a, team_b, goals_a, goals_b in results:
+        fe.update_ratings(ratings, match_counts, match_history, team_a, team_b,
+                          goals_a, goals_b, True, verbose=False)
+    return ratings, match_counts, match_history
+
+
+def replay_from_scratch(match_history):
+    """Replays copies of the match records from empty ratings and returns the state."""
+    match_history = [dict(match) for match in match_history]
+    ratings, match_counts = {}, {}
+    fe.replay_matches(match_history, 0, ratings, match_counts)
+    return ratings, match_counts, match_history
+
+
+class TailReplayTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        teams = [f"Team {i}" for i in range(8)]
+        results = [(*rng.sample(teams, 2), rng.randrange(5), rng.randrange(5)) for _ in range(60)]
+        # A team whose only match sits mid-history
+        results.insert(30, ("Team 0", "Newcomer", 2, 1))
+        self.ratings, self.match_counts, self.match_history = build_history(results)
+
+    def assert_matches_full_replay(self):
+        self.assertEqual((self.ratings, self.match_counts, self.match_history),
+                         replay_from_scratch(self.match_history))
+
+    def test_mid_history_edit_matches_a_full_replay(self):
+        fe.rescore_match(self.ratings, self.match_history, self.match_counts, 30, 0, 3)
+        self.assert_matches_full_replay()
+        fe.rescore_match(self.ratings, self.match_history, self.match_counts, 12, 4, 4)
+        self.assert_matches_full_replay()
+
+    def test_mid_history_delete_matches_a_full_replay(self):
+        fe.remove_match(self.ratings, self.match_history, self.match_counts, 20)
+        self.assert_matches_full_replay()
+        self.assertEqual([match['match_id'] for match in self.match_history], list(range(1, 61)))
+        # Deleting the newcomer's only match drops the team entirely
+        fe.remove_match(self.ratings, self.match_history, self.match_counts, 29)
+        self.assert_matches_full_replay()
+        self.assertNotIn("Newcomer", self.ratings)
+
+
+class LeagueStandingsPatchTest(unittest.TestCase):
+    def assert_matches_rebuild(self, match_history):
+        cached = fe.calculate_league_standings(match_history)
+        rebuilt = fe.compute_league_standings(match_history)
+        self.assertEqual(cached, rebuilt)
+        self.assertEqual(list(cached), list(rebuilt))
+
+    def test_edit_of_a_teams_only_match_keeps_table_order(self):
+        ratings, match_counts, match_history = build_history([
+            ('X', 'B', 1, 1),
+            ('B', 'C', 2, 0),
+            ('C', 'B', 1, 1),
+        ])
+        fe.calculate_league_order(match_history)
+        fe.rescore_match(ratings, match_history, match_counts, 0, 3, 0)
+        self.assert_matches_rebuild(match_history)
+        self.assertEqual(list(fe.calculate_league_standings(match_history)), ['X', 'B', 'C'])
+
+    def test_replacing_the_last_match_is_noticed_without_a_version_bump(self):
+        ratings, match_counts, match_history = build_history([
+            ('A', 'B', 1, 0),
+            ('B', 'C', 2, 0),
+        ])
+        fe.calculate_league_standings(match_history)
+        match_history.pop()
+        fe.update_ratings(ratings, match_counts, match_history, 'C', 'A', 3, 3, True, verbose=False)
+        self.assert_matches_rebuild(match_history)
+
+    def test_patched_standings_equal_rebuilt_standings(self):
+        rng = random.Random(7)
+        teams = [f"Team {i}" for i in range(8)]
+        results = [(*rng.sample(teams, 2), rng.randrange(4), rng.randrange(4)) for _ in range(60)]
+        ratings, match_counts, match_history = build_history(results)
+        for _ in range(40):
+            fe.calculate_league_order(match_history)
+            index = rng.randrange(len(match_history))
+            if rng.random() < 0.6:
+                fe.rescore_match(ratings, match_history, match_counts, index,
+                                 rng.randrange(4), rng.randrange(4))
+            else:
+                fe.remove_match(ratings, match_history, match_counts, len(match_history) - 1)
+            self.assert_matches_rebuild(match_history)
+
+
+class RankingsTest(unittest.TestCase):
+    def setUp(self):
+        # Ties included, so the partial selection must keep the full sort's order
+        self.ratings = {f"Team {i}": 1500.0 + (i * 7) % 13 for i in range(40)}
+        self.match_counts = {team: 6 for team in self.ratings}
+
+    def rankings_output(self, limit=None):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            fe.display_rankings(self.ratings, self.match_counts, limit)
+        return output.getvalue().splitlines()
+
+    def test_limit_shows_the_top_of_the_full_table(self):
+        full = self.rankings_output()
+        top = self.rankings_output(limit=10)
+        header = 5
+        self.assertEqual(top[:header + 10], full[:header + 10])
+        self.assertEqual(len(top), len(full) - 30)
+        self.assertIn("Total Teams: 40", top)
+
+    def test_rankings_menu_option_passes_the_limit(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(fe, 'JSON_FILENAME', os.path.join(directory, 'data.json')), \
+                mock.patch.object(fe, 'BACKUP_DIR', os.path.join(directory, 'backups')), \
+                mock.patch.object(fe, 'load_data', return_value=(self.ratings, [], self.match_counts)), \
+                mock.patch.object(fe, 'display_rankings') as display_rankings, \
+                mock.patch('builtins.input', side_effect=['2', '3', '2', '', '13']), \
+                contextlib.redirect_stdout(io.StringIO()):
+            fe.main()
+        self.assertEqual(display_rankings.call_args_list, [
+            mock.call(self.ratings, self.match_counts, 3),
+            mock.call(self.ratings, self.match_counts, None),
+        ])
+
+
+class SeasonPredictionTest(unittest.TestCase):
+    def test_finished_season_is_not_simulated(self):
+        ratings, match_counts, match_history = build_history([
+            ('A', 'B', 2, 0), ('B', 'A', 1, 1),
+            ('A', 'C', 1, 0), ('C', 'A', 0, 3),
+            ('B', 'C', 2, 2), ('C', 'B', 0, 1),
+        ])
+        with mock.patch.object(fe, 'simulate_season') as simulate_season:
+            prediction = fe.compute_season_prediction(match_history, ratings)
+        simulate_season.assert_not_called()
+        self.assertEqual(prediction['num_simulations'], 0)
+        self.assertEqual(list(prediction['teams']), ['A', 'B', 'C'])
+        self.assertEqual(prediction['teams']['A']['champion_probability'], 100.0)
+        self.assertEqual(prediction['teams']['B']['points_range'], (5, 5))
+
+    def test_display_generates_fixtures_once(self):
+        ratings, match_counts, match_history = build_history([
+            ('A', 'B', 2, 0), ('B', 'C', 1, 1), ('C', 'A', 0, 1),
+        ])
+        with mock.patch.object(fe, 'generate_remaining_fixtures',
+                               wraps=fe.generate_remaining_fixtures) as generate, \
+                mock.patch.object(fe, 'default_simulation_count', return_value=50), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            fe.display_season_prediction(match_history, ratings)
+        self.assertEqual(generate.call_count, 1)
+        self.assertIn("Based on 50 Monte Carlo simulations", output.getvalue())
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'data.json')
+        revisions = mock.patch.dict(fe._revisions, clear=True)
+        revisions.start()
+        self.addCleanup(revisions.stop)
+        self.ratings, self.match_counts, self.match_history = {}, {}, []
+
+    def state(self):
+        return self.ratings, self.match_history, self.match_counts
+
+    def record(self, team_a, team_b, goals_a, goals_b):
+        fe.update_ratings(self.ratings, self.match_counts, self.match_history,
+                          team_a, team_b, goals_a, goals_b, True, verbose=False)
+        fe.append_match(self.match_history[-1], self.filename)
+
+    def delete(self, match_id):
+        fe.remove_match(self.ratings, self.match_history, self.match_counts, match_id - 1)
+        fe.append_change({'op': 'delete', 'match_id': match_id}, self.filename)
+
+    def edit(self, match_id, goals_a, goals_b):
+        fe.rescore_match(self.ratings, self.match_history, self.match_counts, match_id - 1,
+                         goals_a, goals_b)
+        fe.append_change({'op': 'edit', 'match_id': match_id, 'goals_a': goals_a, 'goals_b': goals_b},
+                         self.filename)
+
+    def record_round(self):
+        for team_a, team_b, goals_a, goals_b in [("A", "B", 2, 0), ("C", "D", 1, 1), ("B", "C", 0, 3),
+                                                 ("D", "A", 2, 2), ("A", "C", 1, 0), ("B", "D", 4, 1)]:
+            self.record(team_a, team_b, goals_a, goals_b)
+
+    def save(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            fe.save_data(self.ratings, self.match_history, self.match_counts, self.filename)
+
+    def reload(self):
+        """Loads the data file and journal the way a fresh start would."""
+        fe._revisions.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fe.load_data(self.filename)
+
+    def test_journaled_matches_are_loaded_without_a_data_file(self):
+        self.record_round()
+        self.assertFalse(os.path.exists(self.filename))
+        with open(fe.journal_path(self.filename), 'rb') as f:
+            self.assertEqual(len(f.readlines()), 6)
+        self.assertEqual(self.reload(), self.state())
+
+    def test_save_folds_the_journal_into_the_data_file(self):
+        self.record_round()
+        self.save()
+        self.assertFalse(os.path.exists(fe.journal_path(self.filename)))
+        self.assertEqual(self.reload(), self.state())
+        # Later matches are journaled on top of the saved file
+        self.record("C", "A", 0, 1)
+        self.assertEqual(self.reload(), self.state())
+
+    def test_stale_journal_after_compaction_is_ignored(self):
+        self.record_round()
+        self.edit(3, 1, 1)
+        with open(fe.journal_path(self.filename), 'rb') as f:
+            journal = f.read()
+        self.save()
+        # The pre-compaction journal turns up again, as after a lost removal
+        with open(fe.journal_path(self.filename), 'wb') as f:
+            f.write(journal)
+        self.assertEqual(self.reload(), self.state())
+
+    def test_edits_and_deletes_are_replayed(self):
+        self.record_round()
+        self.save()
+        self.edit(2, 3, 0)
+        self.delete(4)
+        self.record("C", "A", 0, 1)
+        self.edit(6, 2, 2)
+        self.delete(1)
+        ratings, match_history, match_counts = self.reload()
+        self.assertEqual((ratings, match_history, match_counts), self.state())
+        self.assertEqual([match['match_id'] for match in match_history], [1, 2, 3, 4, 5])
+        self.assertEqual((match_history[-1]['goals_a'], match_history[-1]['goals_b']), (2, 2))
+
+    def test_journal_left_behind_by_a_crash_during_save_is_ignored(self):
+        self.record_round()
+        self.delete(2)
+        self.delete(4)
+        # Crash after the data file is replaced but before the journal is removed
+        with mock.patch.object(fe.os, 'remove', side_effect=OSError):
+            self.save()
+        self.assertTrue(os.path.exists(fe.journal_path(self.filename)))
+        self.assertEqual(self.reload(), self.state())
+
+    def test_changes_after_a_stale_journal_are_replayed(self):
+        self.record_round()
+        self.delete(1)
+        with mock.patch.object(fe.os, 'remove', side_effect=OSError):
+            self.save()
+        self.ratings, self.match_history, self.match_counts = self.reload()
+        self.record("D", "A", 1, 0)
+        self.delete(1)
+        self.assertEqual(self.reload(), self.state())
+
+
+class BackupTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'data.json')
+        for patch in (mock.patch.object(fe, 'BACKUP_DIR', os.path.join(directory.name, 'backups')),
+                      mock.patch.dict(fe._revisions, clear=True)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.ratings, self.match_counts, self.match_history = build_history([("A", "B", 2, 1)])
+
+    def save(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            fe.save_data(self.ratings, self.match_history, self.match_counts, self.filename)
+
+    def backup_paths(self):
+        return [os.path.join(fe.BACKUP_DIR, backup) for backup in fe.list_backups()]
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def load(self, filename):
+        fe._revisions.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fe.load_data(filename)
+
+    def restore(self, backup, filename):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(fe.restore_backup(backup, filename))
+
+    def test_backup_hardlinks_the_data_file(self):
+        self.save()
+        fe.create_backup(self.filename)
+        [backup] = self.backup_paths()
+        self.assertTrue(os.path.samefile(backup, self.filename))
+
+    def test_identical_content_is_backed_up_once(self):
+        self.save()
+        fe.create_backup(self.filename)
+        fe.create_backup(self.filename)
+        [backup] = self.backup_paths()
+        saved = self.read(backup)
+        # Saving replaces the data file, so the linked backup keeps the old content
+        fe.update_ratings(self.ratings, self.match_counts, self.match_history,
+                          "B", "A", 0, 0, True, verbose=False)
+        self.save()
+        self.assertEqual(self.read(backup), saved)
+        fe.create_backup(self.filename)
+        self.assertEqual(len(self.backup_paths()), 2)
+
+    def test_backup_falls_back_to_a_copy_when_linking_fails(self):
+        self.save()
+        with mock.patch.object(fe.os, 'link', side_effect=OSError):
+            fe.create_backup(self.filename)
+        [backup] = self.backup_paths()
+        self.assertFalse(os.path.samefile(backup, self.filename))
+        self.assertEqual(self.read(backup), self.read(self.filename))
+
+    def test_retention_follows_max_backups_set_at_runtime(self):
+        with mock.patch.object(fe, 'MAX_BACKUPS', 2):
+            for goals in range(4):
+                fe.update_ratings(self.ratings, self.match_counts, self.match_history,
+                                  "B", "A", goals, 0, True, verbose=False)
+                self.save()
+                fe.create_backup(self.filename)
+        self.assertEqual(len(fe.list_backups()), 2)
+
+    def test_gzip_save_is_restored_from_backup(self):
+        self.filename += '.gz'
+        self.save()
+        self.assertEqual(self.read(self.filename)[:2], b'\x1f\x8b')
+        saved = self.load(self.filename)
+        self.assertEqual(saved, (self.ratings, self.match_history, self.match_counts))
+        fe.create_backup(self.filename)
+        [backup] = fe.list_backups()
+        self.assertTrue(backup.endswith('.json.gz'))
+        fe.update_ratings(self.ratings, self.match_counts, self.match_history,
+                          "B", "A", 0, 0, True, verbose=False)
+        self.save()
+        self.restore(backup, self.filename)
+        self.assertEqual(self.load(self.filename), saved)
+
+    def test_plain_backup_is_restored_into_a_gzip_data_file(self):
+        self.save()
+        fe.create_backup(self.filename)
+        [backup] = fe.list_backups()
+        saved = self.load(self.filename)
+        compressed = self.filename + '.gz'
+        self.restore(backup, compressed)
+        self.assertEqual(self.read(compressed)[:2], b'\x1f\x8b')
+        self.assertEqual(self.load(compressed), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()